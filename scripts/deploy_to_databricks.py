@@ -15,16 +15,40 @@
 from pathlib import Path
 # os provides functions for interacting with the operating system, like accessing environment variables.
 import os
-# glob finds all pathnames matching a specified pattern (e.g., all files with a .ipynb extension).
-import glob
 # json is used for parsing JSON data, which is the format for dashboards and job definitions.
 import json
-# subprocess allows for running external commands, which is used to call the Databricks CLI.
-import subprocess
-# requests is a powerful library for making HTTP requests to external APIs.
-import requests
+# hashlib fingerprints asset definitions, so unchanged assets can be skipped.
+import hashlib
+# orjson is an optional, faster JSON parser that reads bytes directly.
+# The standard library parser is used when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# base64 encodes notebook content for the Workspace Import API.
+import base64
+# mmap lets notebook files be encoded straight from the OS page cache, without a bytes copy.
+import mmap
+# contextlib.nullcontext stands in for the memory map of an empty file.
+import contextlib
 # sys provides access to system-specific parameters and functions, such as exiting the script.
 import sys
+# time is used to wait before retrying a rate-limited request.
+import time
+# logging reports progress; a queue hands the records to a background thread that writes them.
+import logging
+import logging.handlers
+import queue
+# functools.lru_cache memoizes the workspace listings, so each one is fetched at most once per run.
+import functools
+# ThreadPoolExecutor runs independent, network-bound API calls concurrently.
+from concurrent.futures import ThreadPoolExecutor
+# itertools.chain puts the first discovered file back in front of the rest.
+import itertools
+# threading guards the one-time creation of the shared HTTP session.
+import threading
+# requests (HTTP client) is imported lazily where it is needed, so importing this module
+# stays cheap and free of side effects, e.g. when a helper is used in tests.
 
 # -------------------------------
 # Read environment variables for authentication
@@ -35,108 +59,722 @@ HOST = os.environ.get("DATABRICKS_HOST")
 # Databricks Personal Access Token for API authentication.
 TOKEN = os.environ.get("DATABRICKS_TOKEN")
 
-# Exit if credentials are not found. This is a crucial security and stability check.
-if not HOST or not TOKEN:
-    print("❌ DATABRICKS_HOST or DATABRICKS_TOKEN not set in environment.")
-    sys.exit(1)
-
-# Set up the standard headers for all API requests.
-# The Authorization header uses a Bearer token for authentication.
-# The Content-Type header specifies that the request body will be JSON.
-HEADERS = {
-    "Authorization": f"Bearer {TOKEN}",
-    "Content-Type": "application/json"
-}
+# Upper bound on concurrent API calls. Each worker only waits on the network,
+# so a modest pool overlaps round trips without tripping Databricks rate limits.
+MAX_WORKERS = 16
+
+# How many times a rate-limited (HTTP 429) or failed idempotent write is retried before giving up.
+MAX_RETRIES = 5
+
+# Longest wait (in seconds) before a retry, even if the server's Retry-After asks for more,
+# so a single response cannot stall a worker (and the CI step) for a long time.
+MAX_RETRY_WAIT = 60
+
+# Sustained request rate the script stays under, so a large concurrent fan-out does not run into
+# the workspace's rate limits and spend its time in 429 back-off instead.
+REQUESTS_PER_MINUTE = 300
+
+# Seconds to wait for the server before a request is treated as lost.
+REQUEST_TIMEOUT = 60
+
+# Local record of what previous runs deployed (per asset: remote etag, content hash and file stamp).
+# The deploy workflow restores and saves it with actions/cache, so CI runs can skip unchanged assets.
+STATE_FILE = ".deploy_state.json"
+
+# Logger for all progress and error messages of this script.
+log = logging.getLogger("deploy_to_databricks")
+
+_session_lock = threading.Lock()
+_state_lock = threading.Lock()
+
+
+# -------------------------------
+# Function: Credentials check
+# -------------------------------
+def _require_creds():
+    # Exits if credentials are not found. This is a crucial security and stability check.
+    # It is called by every deploy function, so merely importing this module never exits.
+    if not HOST or not TOKEN:
+        log.error("❌ DATABRICKS_HOST or DATABRICKS_TOKEN not set in environment.")
+        sys.exit(1)
+
+
+# -------------------------------
+# Function: Shared HTTP session
+# -------------------------------
+@functools.lru_cache(maxsize=1)
+def _build_session():
+    # Creates the shared session. Only called through `get_session`.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Set up the standard headers for all API requests.
+    # The Authorization header uses a Bearer token for authentication.
+    # The Content-Type header specifies that the request body will be JSON.
+    session.headers.update({
+        "Authorization": f"Bearer {TOKEN}",
+        "Content-Type": "application/json"
+    })
+    # Size the connection pool to match the worker pool, so concurrent workers never wait for
+    # (or throw away) a connection. urllib3 only retries failures to connect, where nothing was sent
+    # yet. Error statuses (including 429 with Retry-After), lost responses and other errors are left
+    # to `safe_request`, so every retry goes through the rate limiter and respects `idempotent`.
+    session.mount("https://", HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(total=3, connect=3, read=False, other=0, backoff_factor=0.3,
+                          respect_retry_after_header=False),
+    ))
+    return session
+
+
+def get_session():
+    # Returns the single Session shared by every API call in the script. It keeps connections to the
+    # Databricks host alive, so the TCP and TLS handshake is paid once instead of once per request.
+    # It is created on first use; the lock ensures concurrent workers never create two.
+    with _session_lock:
+        return _build_session()
+
+
+# -------------------------------
+# Rate limiter
+# -------------------------------
+class TokenBucket:
+    # Thread-safe token bucket: allows bursts of up to `per_minute` requests and refills at
+    # `per_minute` tokens per minute. `acquire` blocks the calling worker until a token is free.
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Waiting workers queue up on the lock, so tokens are handed out one at a time.
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.last = time.monotonic()
+            self.tokens -= 1
+
+
+RATE_LIMITER = TokenBucket(REQUESTS_PER_MINUTE)
+
+
+# -------------------------------
+# Function: Safe API request
+# -------------------------------
+def safe_request(method, url, idempotent=False, **kwargs):
+    # Helper for making API requests through the shared session.
+    # This centralizes error handling and makes the main code cleaner.
+    # Pass `idempotent=True` for writes that are safe to repeat (overwriting imports, resets,
+    # PATCHes of a full definition): those are also retried after a timeout or server error,
+    # as every GET is.
+    import requests
+
+    idempotent = idempotent or method.lower() == "get"
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    session = get_session()
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            last_attempt = attempt == MAX_RETRIES
+            # Wait for the rate limiter, then use the shared session to send an HTTP request.
+            RATE_LIMITER.acquire()
+            try:
+                resp = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                # The response was lost; only a write that is safe to repeat may be sent again.
+                if not idempotent or last_attempt:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            # A 429 means the request was rejected before being processed, so it is safe to retry
+            # for every method. Only the calling worker waits; the other workers keep deploying.
+            retryable = resp.status_code == 429 or (idempotent and resp.status_code >= 500)
+            if not retryable or last_attempt:
+                break
+            # Wait as long as the server asks (Retry-After in seconds, up to MAX_RETRY_WAIT),
+            # else back off exponentially.
+            retry_after = resp.headers.get("Retry-After", "")
+            time.sleep(min(float(retry_after), MAX_RETRY_WAIT) if retry_after.isdigit() else 2 ** attempt)
+        # Check if the request was successful (status code 2xx).
+        # If not, it raises an HTTPError.
+        resp.raise_for_status()
+        # If successful, return the response object.
+        return resp
+    except requests.RequestException as e:
+        # Catch any requests-related errors (e.g., network issues, bad status codes)
+        # and log a descriptive error message.
+        log.error(f"❌ {method.upper()} {url} failed: {e}")
+        # Return None to indicate a failure.
+        return None
+
+
+# -------------------------------
+# Function: Logging
+# -------------------------------
+def start_logging():
+    # Routes log records through a queue to a single background thread that writes them to stdout.
+    # Workers only enqueue a record and go straight back to the network, instead of contending
+    # for the stdout lock, and every message is written as one whole line.
+    # Returns the listener, which must be stopped to flush the remaining records.
+    log_queue = queue.Queue(-1)
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+# -------------------------------
+# Function: File helpers
+# -------------------------------
+def iter_files(directory, suffix):
+    # Yields the paths of all files in `directory` whose name ends with `suffix`, as they are found.
+    # A single `os.scandir` pass with a plain suffix check avoids the pattern matching
+    # and extra `stat()` calls that `glob` does. A missing directory yields no files.
+    if not os.path.isdir(directory):
+        return
+    with os.scandir(directory) as entries:
+        for e in entries:
+            if e.name.endswith(suffix) and e.is_file():
+                yield e.path
+
+
+def fan_out(worker, paths):
+    # Runs `worker(path)` concurrently for every path and returns the results in path order.
+    # Each path is submitted as soon as the iterator yields it, so the first request is already
+    # in flight while the directory is still being scanned.
+    # Collecting the results re-raises any unexpected exception from a worker.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(worker, path) for path in paths]
+        return [future.result() for future in futures]
+
+
+def read_bytes(path):
+    # Returns the raw contents of a file.
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def file_stamp(path):
+    # Returns the modification time (in nanoseconds) and size of a file.
+    # A file whose stamp matches the one recorded at its last deploy is treated as unchanged.
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def parse_json(raw):
+    # Parses JSON from bytes or str, with orjson when it is installed.
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def load_json_file(path):
+    # Reads a JSON file as raw bytes and parses it in one step.
+    # Both parsers accept bytes, so there is no separate text-decoding pass.
+    return parse_json(read_bytes(path))
+
+
+def dump_json(data, sort_keys=False):
+    # Serializes a request body to bytes. orjson encodes straight to bytes in C, so the
+    # body is sent as-is instead of being re-encoded by `requests` via the stdlib encoder.
+    # The session already sends `Content-Type: application/json`.
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(data, sort_keys=sort_keys).encode()
+
+
+# -------------------------------
+# Function: Definition validation
+# -------------------------------
+# Top-level fields every definition must have, with their expected JSON types.
+# Checking them locally rejects a broken file before it costs an API round trip.
+DASHBOARD_FIELDS = {"pages": list}
+JOB_FIELDS = {"name": str, "tasks": list}
+
+# Job settings that 'jobs/update' merges into the existing ones (by task or cluster key) instead of
+# replacing them. A removed task would survive such a merge, so changes to these use 'jobs/reset'.
+# Removing one of these fields entirely is fine with 'jobs/update' (via `fields_to_remove`).
+MERGED_JOB_FIELDS = {"tasks", "job_clusters"}
+
+
+def invalid_fields(data, fields):
+    # Returns the names of the required fields that are missing or have the wrong type.
+    if not isinstance(data, dict):
+        return list(fields)
+    return [name for name, expected in fields.items() if not isinstance(data.get(name), expected)]
+
+
+# -------------------------------
+# Function: Content hash
+# -------------------------------
+def bytes_hash(raw):
+    # Returns a short fingerprint of raw bytes. BLAKE2b is in the standard library and
+    # faster than SHA-256, and 16 bytes is plenty to detect a changed file.
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def content_hash(data):
+    # Returns a stable fingerprint of a JSON-compatible definition.
+    # Keys are sorted, so two definitions with the same content always hash the same,
+    # regardless of key order in the file or in the API response.
+    return bytes_hash(dump_json(data, sort_keys=True))
+
+
+# -------------------------------
+# Function: Deploy state
+# -------------------------------
+@functools.lru_cache(maxsize=1)
+def _read_state():
+    # Reads the state file. Only called through `load_state`.
+    # A missing or unreadable file simply means nothing is known yet.
+    try:
+        return load_json_file(STATE_FILE)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_state():
+    # Returns the state recorded by previous runs as {asset type: {name: record}}.
+    # The file is read once; the lock ensures concurrent workers all get the same dict,
+    # so no worker records its deploys into a copy that is never saved.
+    with _state_lock:
+        return _read_state()
+
+
+def asset_state(kind):
+    # Returns the (mutable) state records for one asset type, e.g. "dashboards".
+    return load_state().setdefault(kind, {})
+
+
+def save_state():
+    # Writes the state atomically: a crash mid-write never leaves a truncated file behind.
+    tmp_file = f"{STATE_FILE}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(dump_json(load_state(), sort_keys=True))
+    os.replace(tmp_file, STATE_FILE)
+
+
+# -------------------------------
+# Function: Workspace listings
+# -------------------------------
+def _paginate(url, key, params):
+    # Returns every record under `key` from a paginated list endpoint, following
+    # `next_page_token` until the last page. `params` should request the largest page size
+    # the endpoint allows, so a listing takes as few round trips as possible.
+    # Returns None if any page fails, so callers never act on a partial listing.
+    records = []
+    params = dict(params)
+    while True:
+        resp = safe_request("get", url, params=params)
+        if resp is None:
+            return None
+        page = resp.json()
+        records.extend(page.get(key, []))
+        token = page.get("next_page_token")
+        if not token:
+            return records
+        params["page_token"] = token
+
+
+def _list_notebooks():
+    # Returns {path: modification time} for the notebooks in /Shared, where notebooks are deployed,
+    # or None if the request fails. Not cached: it is listed again after the imports.
+    resp = safe_request("get", f"{HOST}/api/2.0/workspace/list", params={"path": "/Shared"})
+    if resp is None:
+        return None
+    objects = resp.json().get("objects", [])
+    return {o["path"]: o.get("modified_at") for o in objects if o.get("object_type") == "NOTEBOOK"}
+
+
+@functools.lru_cache(maxsize=1)
+def _list_dashboards():
+    # Fetches all existing dashboards once and indexes them by display name, so each file is
+    # matched with an O(1) dictionary lookup instead of a linear scan over the workspace.
+    # Returns None if the request fails.
+    dashboards = _paginate(f"{HOST}/api/2.0/lakeview/dashboards", "dashboards", {"page_size": 1000})
+    if dashboards is None:
+        return None
+    return {d["display_name"]: d for d in dashboards if d.get("display_name")}
+
+
+@functools.lru_cache(maxsize=1)
+def _list_jobs():
+    # Fetches all existing jobs once and maps their names to job IDs. If several jobs share a name,
+    # the first one listed is kept. Returns None if the request fails.
+    # 100 is the maximum page size of the Jobs API; tasks are not needed, so they are not expanded.
+    jobs = _paginate(f"{HOST}/api/2.1/jobs/list", "jobs", {"limit": 100, "expand_tasks": "false"})
+    if jobs is None:
+        return None
+    by_name = {}
+    for job in jobs:
+        by_name.setdefault(job["settings"]["name"], job["job_id"])
+    # Drop the listing that earlier versions of this script saved in the state.
+    load_state().pop("jobs_listing", None)
+    return by_name
+
+
+# -------------------------------
+# Function: Deploy Notebooks
+# -------------------------------
+def _deploy_one_notebook(notebook_file, remote_modified):
+    # Imports a single notebook through the Workspace Import API and returns whether it succeeded.
+    # Each import is independent of the others, so this function can run in a worker thread.
+    # `remote_modified` maps workspace paths to their last modification time.
+    target = f"/Shared/{os.path.basename(notebook_file).removesuffix('.ipynb')}_prod"
+
+    # A notebook may only be skipped if the previous run imported it into this workspace and
+    # nobody has modified or deleted it there since (its modification time is unchanged).
+    state = asset_state("notebooks")
+    recorded = state.get(target, {})
+    remote_unchanged = (recorded.get("host") == HOST and recorded.get("modified_at") is not None
+                        and remote_modified.get(target) == recorded["modified_at"])
+
+    # Skip the upload if the file is also the one imported last time.
+    # An unchanged modification time and size skips without opening the file; otherwise
+    # the content hash decides.
+    stamp = file_stamp(notebook_file)
+    if remote_unchanged and recorded.get("stat") == stamp and recorded.get("hash"):
+        log.info(f"⏭️ Unchanged {notebook_file}")
+        return True
+
+    # Hash and encode from a read-only memory map, so only the base64 text is held in Python memory
+    # (workers x one notebook at peak). mmap cannot map an empty file, so that is read as empty bytes.
+    with open(notebook_file, "rb") as f:
+        empty = os.fstat(f.fileno()).st_size == 0
+        with contextlib.nullcontext(b"") if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            file_hash = bytes_hash(data)
+            skip = remote_unchanged and recorded.get("hash") == file_hash
+            content = None if skip else base64.b64encode(data).decode()
+    if skip:
+        state[target] = dict(recorded, stat=stamp)
+        log.info(f"⏭️ Unchanged {notebook_file}")
+        return True
+
+    # JUPYTER is the import format for `.ipynb` files; existing notebooks are overwritten.
+    resp = safe_request("post", f"{HOST}/api/2.0/workspace/import", idempotent=True, data=dump_json({
+        "path": target,
+        "format": "JUPYTER",
+        "content": content,
+        "overwrite": True,
+    }))
+    if resp is None:
+        log.error(f"❌ Failed to deploy {notebook_file}")
+        return False
+    # The new modification time is filled in by `deploy_notebooks` once all imports are done.
+    state[target] = {"host": HOST, "hash": file_hash, "stat": stamp, "modified_at": None}
+    log.info(f"✅ Deployed {notebook_file} -> {target}")
+    return True
+
+
+def deploy_notebooks(notebooks_dir="notebooks"):
+    # Imports every notebook in `notebooks_dir` into the workspace as `/Shared/<name>_prod`,
+    # overwriting any existing copy. Notebooks unchanged since the previous run, both locally
+    # and in the workspace, are skipped.
+    _require_creds()
+
+    # 1. Start scanning the specified directory for notebook files.
+    notebook_files = iter_files(notebooks_dir, ".ipynb")
+    first = next(notebook_files, None)
+
+    # 2. If no files are found, log a warning and exit the function.
+    if first is None:
+        log.warning("⚠️ No notebooks found.")
+        return
+
+    # 3. Fetch the modification times of the deployed notebooks once, before the fan-out.
+    # If the listing fails, nothing is known to be unchanged and every notebook is imported.
+    remote_modified = _list_notebooks() or {}
+
+    # 4. Import all notebooks concurrently, as the scan finds them.
+    # The uploads share the session's keep-alive connections and overlap on the network,
+    # instead of paying a round trip per notebook one after the other.
+    results = fan_out(lambda f: _deploy_one_notebook(f, remote_modified),
+                      itertools.chain([first], notebook_files))
+
+    # 5. Record the modification times of the notebooks imported in this run, with one more
+    # listing, so the next run can tell whether they were changed in the workspace.
+    state = asset_state("notebooks")
+    imported = [t for t, r in state.items() if r.get("host") == HOST and r.get("modified_at") is None]
+    if imported:
+        remote_modified = _list_notebooks() or {}
+        for target in imported:
+            state[target]["modified_at"] = remote_modified.get(target)
+
+    # 6. Fail the deployment if any notebook could not be imported.
+    if not all(results):
+        sys.exit(1)
 
 
 # -------------------------------
 # Function: Deploy Dashboards
 # -------------------------------
+def _deploy_one_dashboard(dashboard_file, existing_by_name):
+    # Creates or updates a single dashboard and returns whether it succeeded.
+    # `existing_by_name` maps display names to the dashboards already in the workspace; it is
+    # shared by all workers and only read here, apart from recording dashboards this run creates.
+
+    # Extract a clean name from the filename by removing the `.lvdash.json` suffix.
+    clean_name = os.path.basename(dashboard_file).removesuffix(".lvdash.json")
+    
+    # Look up what the previous run deployed, then fingerprint the file.
+    # If the file's modification time and size match the record, the recorded hash is reused
+    # without opening the file. The file is only parsed once it is clear that the dashboard
+    # may need an update. A record made against another workspace is ignored.
+    state = asset_state("dashboards")
+    recorded = state.get(clean_name, {})
+    if recorded.get("host") != HOST:
+        recorded = {}
+    stamp = file_stamp(dashboard_file)
+    raw = None
+    if recorded.get("stat") == stamp and recorded.get("hash"):
+        file_hash = recorded["hash"]
+    else:
+        raw = read_bytes(dashboard_file)
+        file_hash = bytes_hash(raw)
+
+    # 1. Check if a dashboard with the same display name already exists.
+    existing = existing_by_name.get(clean_name)
+
+    # Skip without parsing or any further API call if the previous run deployed this exact file
+    # and the dashboard has not been modified since (its etag from the listing is unchanged).
+    if (existing and existing.get("etag") and recorded.get("etag") == existing["etag"]
+            and recorded.get("hash") == file_hash):
+        log.info(f"⏭️ Unchanged {clean_name}")
+        return True
+
+    if raw is None:
+        raw = read_bytes(dashboard_file)
+
+    # Parse and validate the dashboard definition, then set the correct display name and parent path.
+    try:
+        data = parse_json(raw)
+    except ValueError as e:
+        log.error(f"❌ Invalid dashboard {dashboard_file}: {e}")
+        return False
+    invalid = invalid_fields(data, DASHBOARD_FIELDS)
+    if invalid:
+        log.error(f"❌ Invalid dashboard {dashboard_file}: missing or malformed {', '.join(invalid)}")
+        return False
+    data.update({"display_name": clean_name, "parent_path": "/Shared"})
+
+    # 2. Idempotent logic: Update if found, otherwise create.
+    if existing and existing.get("dashboard_id"):
+        # If an existing dashboard with a valid ID is found, prepare to update it.
+        url = f"{HOST}/api/2.0/lakeview/dashboards/{existing['dashboard_id']}"
+
+        # Fetch the deployed definition and skip the write if it already matches the local file.
+        # The dashboard content is returned as a JSON string in `serialized_dashboard`.
+        resp = safe_request("get", url)
+        if resp:
+            remote = resp.json()
+            remote_data = parse_json(remote.get("serialized_dashboard") or "{}")
+            remote_data.update({"display_name": remote.get("display_name"), "parent_path": remote.get("parent_path")})
+            if content_hash(remote_data) == content_hash(data):
+                state[clean_name] = {"host": HOST, "etag": remote.get("etag"), "hash": file_hash, "stat": stamp}
+                log.info(f"⏭️ Unchanged {clean_name}")
+                return True
+
+        # Send a PATCH request with the updated data. PATCH is used for partial updates.
+        resp = safe_request("patch", url, idempotent=True, data=dump_json(data))
+        # Record the deployed version and log a status message based on whether the request was successful.
+        if resp:
+            state[clean_name] = {"host": HOST, "etag": resp.json().get("etag"), "hash": file_hash, "stat": stamp}
+            log.info(f"✅ Updated {clean_name}")
+        else:
+            log.error(f"❌ Failed to update {clean_name}")
+    else:
+        # If no existing dashboard is found, prepare to create a new one.
+        url = f"{HOST}/api/2.0/lakeview/dashboards"
+        # Send a POST request to create the new dashboard.
+        resp = safe_request("post", url, data=dump_json(data))
+        # Record the new dashboard in the index so later lookups in this run see it,
+        # and log a status message based on whether the request was successful.
+        if resp:
+            created = resp.json()
+            existing_by_name[clean_name] = created
+            state[clean_name] = {"host": HOST, "etag": created.get("etag"), "hash": file_hash, "stat": stamp}
+            log.info(f"✅ Created {clean_name}")
+        else:
+            log.error(f"❌ Failed to create {clean_name}")
+    return resp is not None
+
+
 def deploy_dashboards(dashboards_dir="dashboards"):
     # This is the main function to deploy Lakeview dashboards.
     # It reads dashboard definitions from JSON files, checks if they exist in Databricks,
     # and either updates an existing one or creates a new one.
+    _require_creds()
 
-    # 1. Find all dashboard definition files in the specified directory.
-    # The glob module searches for file paths matching a pattern.
-    # Here, it finds all files ending with `.lvdash.json`.
-    dashboard_files = glob.glob(f"{dashboards_dir}/*.lvdash.json")
+    # 1. Start scanning the specified directory for dashboard definition files (ending with `.lvdash.json`).
+    dashboard_files = iter_files(dashboards_dir, ".lvdash.json")
+    first = next(dashboard_files, None)
     
-    # 2. If no files are found, print a warning and exit the function.
-    if not dashboard_files:
-        print("⚠️ No dashboards found.")
+    # 2. If no files are found, log a warning and exit the function.
+    if first is None:
+        log.warning("⚠️ No dashboards found.")
         return
 
-    # 3. Create a requests Session object.
-    # A Session object reuses the same TCP connection for all requests,
-    # which is more efficient for multiple API calls.
-    session = requests.Session()
-    # Apply the standard headers (Authorization, Content-Type) to the session.
-    session.headers.update(HEADERS)
+    # 3. Fetch all existing dashboards from Databricks once, before the fan-out.
+    # This is a key optimization to avoid repeatedly calling the API for every file.
+    # Without the listing we cannot tell updates from creates, so stop instead of creating duplicates.
+    existing_by_name = _list_dashboards()
+    if existing_by_name is None:
+        sys.exit(1)
 
-    # 4. Define a helper function for making API requests.
-    # This centralizes error handling and makes the main code cleaner.
-    def safe_request(method, url, **kwargs):
-        try:
-            # Use the session to send an HTTP request.
-            resp = session.request(method, url, **kwargs)
-            # Check if the request was successful (status code 2xx).
-            # If not, it raises an HTTPError.
-            resp.raise_for_status()
-            # If successful, return the response object.
-            return resp
-        except requests.RequestException as e:
-            # Catch any requests-related errors (e.g., network issues, bad status codes)
-            # and print a descriptive error message.
-            print(f"❌ {method.upper()} {url} failed: {e}")
-            # Return None to indicate a failure.
-            return None
+    # 4. Deploy all dashboard files concurrently, as the scan finds them.
+    # The calls are purely network-bound, so threads overlap the round trips and the
+    # total wall-clock time is close to the slowest single deploy instead of the sum of all.
+    results = fan_out(lambda f: _deploy_one_dashboard(f, existing_by_name),
+                      itertools.chain([first], dashboard_files))
+
+    # 5. Fail the deployment if any dashboard could not be deployed.
+    if not all(results):
+        sys.exit(1)
+
+
+# -------------------------------
+# Function: Deploy Jobs
+# -------------------------------
+def _deploy_one_job(job_file, existing_by_name):
+    # Creates or updates a single job and returns whether it succeeded.
+    # `existing_by_name` maps job names to the IDs of the jobs already in the workspace.
+
+    # Load the job definition. Each JSON file is expected to define a single Databricks job.
+    # The raw bytes are kept, so request bodies can embed the file as-is instead of re-serializing it.
+    raw = read_bytes(job_file)
+    try:
+        job_def = parse_json(raw)
+    except ValueError as e:
+        log.error(f"❌ Invalid job {job_file}: {e}")
+        return False
+    invalid = invalid_fields(job_def, JOB_FIELDS)
+    if invalid:
+        log.error(f"❌ Invalid job {job_file}: missing or malformed {', '.join(invalid)}")
+        return False
+    job_name = job_def["name"]
+
+    # 1. Check if a job with the same name already exists.
+    job_id = existing_by_name.get(job_name)
+
+    # The state records which top-level fields the previous run deployed for this job in this
+    # workspace, so fields since removed from the file can be removed from the job as well.
+    state = asset_state("jobs")
+    recorded = state.get(job_name, {})
+    recorded_keys = recorded.get("keys") if recorded.get("host") == HOST else None
+
+    # 2. Idempotent logic: Update if found, otherwise create.
+    if job_id:
+        # Compare the deployed settings with the local file before writing.
+        # Only the keys present in the local file (or in the previously deployed one) are compared,
+        # because the API also returns server-side defaults.
+        # If the settings cannot be fetched, every field counts as changed.
+        resp = safe_request("get", f"{HOST}/api/2.1/jobs/get", params={"job_id": job_id})
+        changed = list(job_def)
+        removed = [k for k in recorded_keys or [] if k not in job_def]
+        if resp:
+            settings = resp.json().get("settings", {})
+            changed = [k for k in job_def if settings.get(k) != job_def[k]]
+            removed = [k for k in removed if settings.get(k) is not None]
+            if not changed and not removed:
+                state[job_name] = {"host": HOST, "keys": sorted(job_def)}
+                log.info(f"⏭️ Unchanged job {job_name} (id={job_id})")
+                return True
 
-    # 5. Fetch all existing dashboards from Databricks in a single API call.
-    # This is a key optimization to avoid repeatedly calling the API inside the loop.
-    resp = safe_request("get", f"{HOST}/api/2.0/lakeview/dashboards")
-    # Parse the JSON response. If the request failed (resp is None), default to an empty list.
-    dashboards = resp.json().get("dashboards", []) if resp else []
-
-    # 6. Loop through each dashboard file found in the local directory.
-    for dashboard_file in dashboard_files:
-        # Extract a clean name from the filename by removing the `.lvdash.json` suffix.
-        clean_name = os.path.basename(dashboard_file).replace(".lvdash.json", "")
-        
-        # Open and load the JSON content of the dashboard definition file.
-        with open(dashboard_file, "r") as f:
-            data = json.load(f)
-
-        # Update the dashboard data with the correct display name and parent path.
-        data.update({"display_name": clean_name, "parent_path": "/Shared"})
-
-        # 7. Check if a dashboard with the same display name already exists.
-        # The `next()` function efficiently finds the first matching item in the list.
-        # The generator expression `(d for ...)` creates an iterator, so it stops searching once a match is found.
-        existing = next((d for d in dashboards if d.get("display_name") == clean_name), None)
-
-        # 8. Idempotent logic: Update if found, otherwise create.
-        if existing and existing.get("dashboard_id"):
-            # If an existing dashboard with a valid ID is found, prepare to update it.
-            url = f"{HOST}/api/2.0/lakeview/dashboards/{existing['dashboard_id']}"
-            # Send a PATCH request with the updated data. PATCH is used for partial updates.
-            resp = safe_request("patch", url, json=data)
-            # Print a status message based on whether the request was successful.
-            print(f"✅ Updated {clean_name}" if resp else f"❌ Failed to update {clean_name}")
+        if recorded_keys is not None and MERGED_JOB_FIELDS.isdisjoint(changed):
+            # 'jobs/update' replaces only the top-level fields it is sent, so only the changed ones are
+            # sent, and removes the fields listed in `fields_to_remove`. Without a record of the
+            # previously deployed fields, removed ones cannot be known, so 'jobs/reset' is used instead.
+            resp = safe_request("post", f"{HOST}/api/2.1/jobs/update", idempotent=True, data=dump_json({
+                "job_id": job_id,
+                "new_settings": {k: job_def[k] for k in changed},
+                "fields_to_remove": removed,
+            }))
         else:
-            # If no existing dashboard is found, prepare to create a new one.
-            url = f"{HOST}/api/2.0/lakeview/dashboards"
-            # Send a POST request to create the new dashboard.
-            resp = safe_request("post", url, json=data)
-            # Print a status message based on whether the request was successful.
-            print(f"✅ Created {clean_name}" if resp else f"❌ Failed to create {clean_name}")
+            # 'jobs/reset' replaces all settings of the existing job with the local definition.
+            # The body is templated around the file bytes, which were validated as a JSON object above.
+            resp = safe_request("post", f"{HOST}/api/2.1/jobs/reset", idempotent=True,
+                                data=b'{"job_id":%d,"new_settings":%s}' % (job_id, raw))
+        if resp:
+            state[job_name] = {"host": HOST, "keys": sorted(job_def)}
+            log.info(f"✅ Updated job {job_name} (id={job_id})")
+        else:
+            log.error(f"❌ Failed to update job {job_name}")
+    else:
+        # 'jobs/create' creates a new job from the definition; the file is the request body.
+        resp = safe_request("post", f"{HOST}/api/2.1/jobs/create", data=raw)
+        # Record the new job's ID in the index so later lookups in this run see it.
+        if resp:
+            existing_by_name[job_name] = resp.json().get("job_id")
+            state[job_name] = {"host": HOST, "keys": sorted(job_def)}
+            log.info(f"✅ Created job {job_name}")
+        else:
+            log.error(f"❌ Failed to create job {job_name}")
+    return resp is not None
+
+
+def deploy_jobs(jobs_dir="jobs"):
+    # Deploys every job definition in `jobs_dir`: existing jobs (matched by name) are updated,
+    # missing ones are created.
+    _require_creds()
+
+    # 1. Start scanning the specified directory for job definition files.
+    job_files = iter_files(jobs_dir, ".json")
+    first = next(job_files, None)
+
+    # 2. If no files are found, log a warning and exit the function.
+    if first is None:
+        log.warning("⚠️ No jobs found.")
+        return
+
+    # 3. Fetch the existing jobs once, before the fan-out.
+    # Without the listing we cannot tell updates from creates, so stop instead of creating duplicates.
+    existing_by_name = _list_jobs()
+    if existing_by_name is None:
+        sys.exit(1)
+
+    # 4. Deploy all job files concurrently, as the scan finds them.
+    results = fan_out(lambda f: _deploy_one_job(f, existing_by_name), itertools.chain([first], job_files))
+
+    # 5. Fail the deployment if any job could not be deployed.
+    if not all(results):
+        sys.exit(1)
 
 
 # -------------------------------
 # Main execution
 # -------------------------------
+# Maps each asset type that can be named on the command line to its deploy function.
+DEPLOYERS = {
+    "notebooks": deploy_notebooks,
+    "jobs": deploy_jobs,
+    "dashboards": deploy_dashboards,
+}
+
 # This block ensures that the functions are called only when the script is executed directly.
+# Pass one or more asset types (e.g. `notebooks`) to deploy only those; with no arguments, everything is deployed.
 if __name__ == "__main__":
-     
-    deploy_dashboards()   
-  
\ No newline at end of file
+    targets = sys.argv[1:] or list(DEPLOYERS)
+    unknown = [t for t in targets if t not in DEPLOYERS]
+    if unknown:
+        print(f"❌ Unknown asset type(s): {', '.join(unknown)}. Choose from: {', '.join(DEPLOYERS)}")
+        sys.exit(1)
+
+    # Save the deploy state even if a deploy function exits early, so the work that did
+    # succeed is not repeated on the next run. Stopping the listener flushes queued messages.
+    listener = start_logging()
+    try:
+        for target in targets:
+            DEPLOYERS[target]()
+    finally:
+        save_state()
+        listener.stop()
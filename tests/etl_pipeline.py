@@ -1,26 +1,35 @@
 # etl_pipeline.py
 
 from pyspark.sql import DataFrame
-from pyspark.sql.functions import col, concat_ws, to_timestamp
+from pyspark.sql.functions import col, concat, lit, to_timestamp, sum as sum_
 from typing import Tuple
 
+PAAKREVDE_KOLONNER = ["Sted", "Dato", "Klokkeslett", "Antall_ledige_plasser"]
+
 def sjekk_duplikater(df: DataFrame) -> DataFrame:
-    df_with_id = df.withColumn("unique_id", concat_ws("_", col("Sted"), col("Dato"), col("Klokkeslett")))
-    df_deduped = df_with_id.dropDuplicates(["Sted", "Dato", "Klokkeslett"]).drop("unique_id")
-    return df_deduped
+    return df.dropDuplicates(["Sted", "Dato", "Klokkeslett"])
 
-def valider_manglende(df: DataFrame) -> None:
-    for col_name in ["Sted", "Dato", "Klokkeslett", "Antall_ledige_plasser"]:
-        if df.filter(col(col_name).isNull()).count() > 0:
-            raise ValueError(f"Manglende verdier i {col_name}")
+def valider(df: DataFrame) -> None:
+    # Én aggregering (én Spark-jobb) teller både manglende og negative verdier
+    row = df.agg(
+        *[sum_(col(c).isNull().cast("int")).alias(f"n_{c}") for c in PAAKREVDE_KOLONNER],
+        sum_((col("Antall_ledige_plasser") < 0).cast("int")).alias("n_neg")
+    ).first().asDict()
 
-def valider_gyldige_verdier(df: DataFrame) -> None:
-    negative = df.filter(col("Antall_ledige_plasser") < 0).count()
-    if negative > 0:
+    for col_name in PAAKREVDE_KOLONNER:
+        if row[f"n_{col_name}"]:
+            raise ValueError(f"Manglende verdier i {col_name}")
+    if row["n_neg"]:
         raise ValueError("Negative verdier i Antall_ledige_plasser")
 
 def konverter_timestamp(df: DataFrame) -> DataFrame:
-    return df.withColumn(
-        "timestamp",
-        to_timestamp(concat_ws(" ", col("Dato"), col("Klokkeslett")), "dd.MM.yyyy HH:mm")
-    ).drop("Dato", "Klokkeslett")
+    # Én select i stedet for withColumn + drop gir ett projeksjonsledd i planen
+    return df.select(
+        *[c for c in df.columns if c not in ("Dato", "Klokkeslett", "timestamp")],
+        # concat med fast skilletegn slipper concat_ws sin null- og separatorhåndtering per rad
+        to_timestamp(concat(col("Dato"), lit(" "), col("Klokkeslett")), "dd.MM.yyyy HH:mm").alias("timestamp")
+    )
+
+def rens_og_konverter(df: DataFrame) -> DataFrame:
+    # Deduplisering og timestamp-konvertering som én flat plan for silver-laget
+    return konverter_timestamp(sjekk_duplikater(df))
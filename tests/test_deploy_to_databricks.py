@@ -0,0 +1,318 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+import deploy_to_databricks as deploy
+
+HOST = "https://example.cloud.databricks.com"
+
+
+def make_response(status_code=200, body=None, headers=None):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = json.dumps(body or {}).encode()
+    resp.headers.update(headers or {})
+    return resp
+
+
+class FakeSession:
+    # Returns the scripted responses (or raises the scripted exceptions) in order
+    # and records every request that was sent.
+    def __init__(self):
+        self.responses = []
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        # Params are copied, since the caller may reuse the dict for the next request.
+        self.calls.append((method, url, dict(kwargs, params=dict(kwargs.get("params") or {}))))
+        result = self.responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def clear_caches():
+    # The state and the workspace listings are cached for a whole run; each test starts afresh.
+    for cached in (deploy._read_state, deploy._list_dashboards, deploy._list_jobs):
+        cached.cache_clear()
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    # Runs each test against a fake session and an empty deploy state in a temporary directory.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(deploy, "HOST", HOST)
+    monkeypatch.setattr(deploy, "TOKEN", "token")
+    monkeypatch.setattr(deploy.time, "sleep", lambda seconds: None)
+    fake = FakeSession()
+    monkeypatch.setattr(deploy, "get_session", lambda: fake)
+    clear_caches()
+    yield fake
+    clear_caches()
+
+
+def test_import_without_credentials_neither_exits_nor_loads_requests():
+    # Runs in a fresh interpreter, so modules imported by this test file do not count.
+    env = {k: v for k, v in os.environ.items() if k not in ("DATABRICKS_HOST", "DATABRICKS_TOKEN")}
+    code = (
+        f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); "
+        "import deploy_to_databricks; "
+        "print('requests' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_safe_request_retries_429(session):
+    session.responses = [make_response(429, headers={"Retry-After": "1"}), make_response(200)]
+    assert deploy.safe_request("post", f"{HOST}/create") is not None
+    assert len(session.calls) == 2
+
+
+def test_safe_request_caps_retry_after(session, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(deploy.time, "sleep", sleeps.append)
+    session.responses = [make_response(429, headers={"Retry-After": "3600"}), make_response(200)]
+    assert deploy.safe_request("get", f"{HOST}/list") is not None
+    assert sleeps == [deploy.MAX_RETRY_WAIT]
+
+
+def test_safe_request_gives_up_after_max_retries(session):
+    session.responses = [make_response(429)] * (deploy.MAX_RETRIES + 1)
+    assert deploy.safe_request("get", f"{HOST}/list") is None
+    assert len(session.calls) == deploy.MAX_RETRIES + 1
+
+
+def test_safe_request_retries_5xx_only_when_idempotent(session):
+    session.responses = [make_response(503)]
+    assert deploy.safe_request("post", f"{HOST}/create") is None
+    assert len(session.calls) == 1
+
+    session.responses = [make_response(503), make_response(200)]
+    assert deploy.safe_request("post", f"{HOST}/reset", idempotent=True) is not None
+    assert len(session.calls) == 3
+
+
+def test_safe_request_retries_timeout_only_when_idempotent(session):
+    session.responses = [requests.Timeout()]
+    assert deploy.safe_request("post", f"{HOST}/create") is None
+    assert len(session.calls) == 1
+
+    session.responses = [requests.Timeout(), make_response(200)]
+    assert deploy.safe_request("get", f"{HOST}/list") is not None
+    assert len(session.calls) == 3
+
+
+def test_paginate_follows_next_page_token(session):
+    session.responses = [
+        make_response(200, {"jobs": [{"job_id": 1}], "next_page_token": "page-2"}),
+        make_response(200, {"jobs": [{"job_id": 2}]}),
+    ]
+    jobs = deploy._paginate(f"{HOST}/api/2.1/jobs/list", "jobs", {"limit": 100})
+    assert jobs == [{"job_id": 1}, {"job_id": 2}]
+    assert "page_token" not in session.calls[0][2]["params"]
+    assert session.calls[1][2]["params"] == {"limit": 100, "page_token": "page-2"}
+
+
+def test_paginate_returns_none_on_failure(session):
+    session.responses = [
+        make_response(200, {"jobs": [{"job_id": 1}], "next_page_token": "page-2"}),
+        make_response(404),
+    ]
+    assert deploy._paginate(f"{HOST}/api/2.1/jobs/list", "jobs", {"limit": 100}) is None
+
+
+def test_dashboard_deploy_aborts_when_listing_fails(session, tmp_path):
+    (tmp_path / "sales.lvdash.json").write_text('{"pages": []}')
+    session.responses = [make_response(404)]
+    with pytest.raises(SystemExit):
+        deploy.deploy_dashboards(str(tmp_path))
+    assert len(session.calls) == 1
+
+
+def write_dashboard(tmp_path, definition):
+    path = tmp_path / "sales.lvdash.json"
+    path.write_bytes(json.dumps(definition).encode())
+    return str(path)
+
+
+def record_dashboard(path, etag, host=HOST):
+    deploy.asset_state("dashboards")["sales"] = {
+        "host": host, "etag": etag, "hash": deploy.bytes_hash(Path(path).read_bytes()),
+    }
+
+
+def test_dashboard_skipped_when_etag_and_hash_match(session, tmp_path):
+    path = write_dashboard(tmp_path, {"pages": []})
+    record_dashboard(path, "e1")
+
+    assert deploy._deploy_one_dashboard(path, {"sales": {"dashboard_id": "d1", "etag": "e1"}})
+    assert session.calls == []
+
+
+def test_dashboard_updated_when_etag_changed(session, tmp_path):
+    path = write_dashboard(tmp_path, {"pages": []})
+    record_dashboard(path, "e1")
+    session.responses = [
+        make_response(200, {"serialized_dashboard": json.dumps({"pages": [{"name": "edited"}]}), "etag": "e2"}),
+        make_response(200, {"etag": "e3"}),
+    ]
+
+    assert deploy._deploy_one_dashboard(path, {"sales": {"dashboard_id": "d1", "etag": "e2"}})
+    assert [call[0] for call in session.calls] == ["get", "patch"]
+    assert deploy.asset_state("dashboards")["sales"] == {
+        "host": HOST, "etag": "e3", "hash": deploy.bytes_hash(Path(path).read_bytes()),
+        "stat": deploy.file_stamp(path),
+    }
+
+
+def test_dashboard_record_from_another_workspace_is_ignored(session, tmp_path):
+    path = write_dashboard(tmp_path, {"pages": []})
+    record_dashboard(path, "e1", host="https://other.cloud.databricks.com")
+    session.responses = [
+        make_response(200, {"serialized_dashboard": json.dumps({"pages": [{"name": "edited"}]}), "etag": "e1"}),
+        make_response(200, {"etag": "e2"}),
+    ]
+
+    assert deploy._deploy_one_dashboard(path, {"sales": {"dashboard_id": "d1", "etag": "e1"}})
+    assert [call[0] for call in session.calls] == ["get", "patch"]
+
+
+def write_job(tmp_path, definition):
+    path = tmp_path / "job.json"
+    path.write_bytes(json.dumps(definition).encode())
+    return str(path)
+
+
+def test_job_partial_update_sends_changed_and_removed_fields(session, tmp_path):
+    path = write_job(tmp_path, {"name": "etl", "tasks": [], "timeout_seconds": 60})
+    deploy.asset_state("jobs")["etl"] = {"host": HOST, "keys": ["name", "tasks", "timeout_seconds", "trigger"]}
+    session.responses = [
+        make_response(200, {"settings": {"name": "etl", "tasks": [], "timeout_seconds": 0, "trigger": {}}}),
+        make_response(200),
+    ]
+
+    assert deploy._deploy_one_job(path, {"etl": 7})
+    method, url, kwargs = session.calls[1]
+    assert url.endswith("/jobs/update")
+    assert json.loads(kwargs["data"]) == {
+        "job_id": 7,
+        "new_settings": {"timeout_seconds": 60},
+        "fields_to_remove": ["trigger"],
+    }
+
+
+def test_job_reset_when_tasks_changed(session, tmp_path):
+    path = write_job(tmp_path, {"name": "etl", "tasks": [{"task_key": "a"}]})
+    deploy.asset_state("jobs")["etl"] = {"host": HOST, "keys": ["name", "tasks"]}
+    session.responses = [make_response(200, {"settings": {"name": "etl", "tasks": []}}), make_response(200)]
+
+    assert deploy._deploy_one_job(path, {"etl": 7})
+    method, url, kwargs = session.calls[1]
+    assert url.endswith("/jobs/reset")
+    assert json.loads(kwargs["data"])["new_settings"] == {"name": "etl", "tasks": [{"task_key": "a"}]}
+
+
+def test_job_reset_without_recorded_fields(session, tmp_path):
+    path = write_job(tmp_path, {"name": "etl", "tasks": [], "timeout_seconds": 60})
+    session.responses = [make_response(200, {"settings": {"name": "etl", "tasks": []}}), make_response(200)]
+
+    assert deploy._deploy_one_job(path, {"etl": 7})
+    assert session.calls[1][1].endswith("/jobs/reset")
+
+
+def test_job_skipped_when_unchanged(session, tmp_path):
+    path = write_job(tmp_path, {"name": "etl", "tasks": []})
+    session.responses = [make_response(200, {"settings": {"name": "etl", "tasks": [], "max_concurrent_runs": 1}})]
+
+    assert deploy._deploy_one_job(path, {"etl": 7})
+    assert len(session.calls) == 1
+
+
+NOTEBOOK_TARGET = "/Shared/sales_prod"
+
+
+def write_notebook(tmp_path, content=b'{"cells": []}'):
+    notebooks_dir = tmp_path / "notebooks"
+    notebooks_dir.mkdir(exist_ok=True)
+    path = notebooks_dir / "sales.ipynb"
+    path.write_bytes(content)
+    return str(path)
+
+
+def record_notebook(path, host=HOST, modified_at=100, **fields):
+    record = {"host": host, "hash": deploy.bytes_hash(Path(path).read_bytes()), "stat": deploy.file_stamp(path),
+              "modified_at": modified_at}
+    record.update(fields)
+    deploy.asset_state("notebooks")[NOTEBOOK_TARGET] = record
+
+
+def test_notebook_skipped_on_matching_stamp(session, tmp_path):
+    path = write_notebook(tmp_path)
+    # A wrong hash shows that the file is not even read when the stamp matches.
+    record_notebook(path, hash="stale")
+
+    assert deploy._deploy_one_notebook(path, {NOTEBOOK_TARGET: 100})
+    assert session.calls == []
+
+
+def test_notebook_skipped_on_matching_hash(session, tmp_path):
+    path = write_notebook(tmp_path)
+    record_notebook(path, stat=[0, 0])
+
+    assert deploy._deploy_one_notebook(path, {NOTEBOOK_TARGET: 100})
+    assert session.calls == []
+    assert deploy.asset_state("notebooks")[NOTEBOOK_TARGET]["stat"] == deploy.file_stamp(path)
+
+
+@pytest.mark.parametrize("remote_modified, host", [
+    ({NOTEBOOK_TARGET: 200}, HOST),
+    ({}, HOST),
+    ({NOTEBOOK_TARGET: 100}, "https://other.cloud.databricks.com"),
+], ids=["modified-in-workspace", "deleted-in-workspace", "other-workspace"])
+def test_notebook_reimported(session, tmp_path, remote_modified, host):
+    path = write_notebook(tmp_path)
+    record_notebook(path, host=host)
+    session.responses = [make_response(200)]
+
+    assert deploy._deploy_one_notebook(path, remote_modified)
+    assert session.calls[0][1].endswith("/workspace/import")
+    assert deploy.asset_state("notebooks")[NOTEBOOK_TARGET]["modified_at"] is None
+
+
+def test_empty_notebook_is_imported(session, tmp_path):
+    path = write_notebook(tmp_path, b"")
+    session.responses = [make_response(200)]
+
+    assert deploy._deploy_one_notebook(path, {})
+    assert json.loads(session.calls[0][2]["data"])["content"] == ""
+    assert deploy.asset_state("notebooks")[NOTEBOOK_TARGET]["hash"] == deploy.bytes_hash(b"")
+
+
+def test_notebook_modified_at_recorded_after_import(session, tmp_path):
+    write_notebook(tmp_path)
+    listing = {"path": NOTEBOOK_TARGET, "object_type": "NOTEBOOK"}
+    session.responses = [
+        make_response(200, {"objects": [dict(listing, modified_at=100)]}),
+        make_response(200),
+        make_response(200, {"objects": [dict(listing, modified_at=300)]}),
+    ]
+
+    deploy.deploy_notebooks(str(tmp_path / "notebooks"))
+    assert [call[1].rsplit("/", 1)[1] for call in session.calls] == ["list", "import", "list"]
+    assert deploy.asset_state("notebooks")[NOTEBOOK_TARGET]["modified_at"] == 300
+
+
+def test_missing_credentials_logged_and_exit(monkeypatch, caplog):
+    monkeypatch.setattr(deploy, "HOST", None)
+    with pytest.raises(SystemExit):
+        deploy.deploy_jobs()
+    assert "DATABRICKS_HOST or DATABRICKS_TOKEN not set" in caplog.text
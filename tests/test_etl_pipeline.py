@@ -1,41 +1,82 @@
 import pytest
+from datetime import datetime
 from pyspark.sql import SparkSession
-from etl_pipeline import sjekk_duplikater, valider_manglende, valider_gyldige_verdier, konverter_timestamp
+from etl_pipeline import sjekk_duplikater, valider, konverter_timestamp, rens_og_konverter
 from pyspark.sql.types import StructType, StructField, StringType, IntegerType
 
-schema = StructType([
+schema_full = StructType([
     StructField("Sted", StringType(), True),
     StructField("Dato", StringType(), True),  # eller DateType hvis du bruker datoer senere
     StructField("Klokkeslett", StringType(), True),
     StructField("Antall_ledige_plasser", IntegerType(), True)
 ])
 
+schema_ts = StructType([
+    StructField("Dato", StringType(), True),
+    StructField("Klokkeslett", StringType(), True)
+])
+
 
 @pytest.fixture(scope="session")
 def spark():
-    return SparkSession.builder.master("local[1]").appName("TestETL").getOrCreate()
+    # Én delt sesjon for hele testkjøringen, tilpasset små testdata:
+    # alle kjerner, én shuffle-partisjon og uten Spark UI.
+    return (
+        SparkSession.builder.master("local[*]")
+        .appName("TestETL")
+        .config("spark.sql.shuffle.partitions", "1")
+        .config("spark.default.parallelism", "2")
+        .config("spark.ui.enabled", "false")
+        .getOrCreate()
+    )
 
-def test_sjekk_duplikater(spark):
+# Test-DataFrames bygges én gang per testkjøring og deles mellom testene.
+@pytest.fixture(scope="session")
+def df_duplikater(spark):
     data = [("A", "01.01.2024", "10:00", 5), ("A", "01.01.2024", "10:00", 5)]
-    df = spark.createDataFrame(data, ["Sted", "Dato", "Klokkeslett", "Antall_ledige_plasser"])
-    df_result = sjekk_duplikater(df)
-    assert df_result.count() == 1
+    return spark.createDataFrame(data, schema=schema_full)
 
-def test_valider_manglende_feiler(spark):
+@pytest.fixture(scope="session")
+def df_manglende(spark):
     data = [("A", None, "10:00", 5)]
-    df = spark.createDataFrame(data, schema=schema)
-    # df = spark.createDataFrame(data, ["Sted", "Dato", "Klokkeslett", "Antall_ledige_plasser"])
-    with pytest.raises(ValueError):
-        valider_manglende(df)
+    return spark.createDataFrame(data, schema=schema_full)
 
-def test_valider_gyldige_verdier_feiler(spark):
+@pytest.fixture(scope="session")
+def df_negative(spark):
     data = [("A", "01.01.2024", "10:00", -1)]
-    df = spark.createDataFrame(data, ["Sted", "Dato", "Klokkeslett", "Antall_ledige_plasser"])
-    with pytest.raises(ValueError):
-        valider_gyldige_verdier(df)
+    return spark.createDataFrame(data, schema=schema_full)
+
+@pytest.fixture(scope="session")
+def df_gyldig(spark):
+    data = [("A", "01.01.2024", "10:00", 0), ("B", "01.01.2024", "10:00", 5)]
+    return spark.createDataFrame(data, schema=schema_full)
 
-def test_konverter_timestamp(spark):
+@pytest.fixture(scope="session")
+def df_dato_tid(spark):
     data = [("01.01.2024", "10:00")]
-    df = spark.createDataFrame(data, ["Dato", "Klokkeslett"])
-    df_result = konverter_timestamp(df)
+    return spark.createDataFrame(data, schema=schema_ts)
+
+def test_sjekk_duplikater(df_duplikater):
+    df_result = sjekk_duplikater(df_duplikater)
+    assert len(df_result.take(2)) == 1
+
+def test_valider_manglende_feiler(df_manglende):
+    with pytest.raises(ValueError):
+        valider(df_manglende)
+
+def test_valider_gyldige_verdier_feiler(df_negative):
+    with pytest.raises(ValueError):
+        valider(df_negative)
+
+def test_valider_gyldig_data(df_gyldig):
+    valider(df_gyldig)
+
+def test_konverter_timestamp(df_dato_tid):
+    df_result = konverter_timestamp(df_dato_tid)
     assert "timestamp" in df_result.columns
+    assert df_result.first()["timestamp"] == datetime(2024, 1, 1, 10, 0)
+
+def test_rens_og_konverter(df_duplikater):
+    df_result = rens_og_konverter(df_duplikater)
+    assert df_result.columns == ["Sted", "Antall_ledige_plasser", "timestamp"]
+    assert len(df_result.take(2)) == 1